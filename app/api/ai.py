@@ -1,12 +1,13 @@
 """API routes for AI features."""
 
+import asyncio
 from typing import Optional
 
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, field_validator
 
-from app.services.ai_service import diagnose_error, generate_commit_message
+from app.services.ai_service import diagnose_error, ensure_configured, generate_commit_message
 from app.services.status_service import get_staged_diff
 
 router = APIRouter()
@@ -32,8 +33,11 @@ class DiagnoseRequest(BaseModel):
 @router.post("/commit-message")
 async def ai_commit_message(req: GenerateMessageRequest):
     """Generate a commit message from the current staged diff."""
+    # Fail fast without running git when Gemini isn't configured.
+    ensure_configured()
     try:
-        diff = get_staged_diff(req.repo_path)
+        # git runs in a worker thread so the event loop keeps serving requests.
+        diff = await asyncio.to_thread(get_staged_diff, req.repo_path)
         message = await generate_commit_message(diff)
         return {"message": message}
     except ValueError as exc:
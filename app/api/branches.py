@@ -3,6 +3,7 @@
 from typing import Optional
 
 from fastapi import APIRouter, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, field_validator
 
 from app.services.branch_service import (
@@ -14,15 +15,15 @@ from app.services.branch_service import (
     list_branches,
     merge_branch,
 )
-from app.services.commit_service import _is_valid_ref_name
+from app.services.commit_service import RefName, _is_valid_ref_name
 
 router = APIRouter()
 
 
-def _validate_ref(name: str) -> str:
+def _validate_ref(name: str) -> RefName:
     if not _is_valid_ref_name(name):
         raise ValueError(f"Invalid branch name: {name!r}")
-    return name
+    return RefName(name)
 
 
 class BranchOut(BaseModel):
@@ -40,7 +41,7 @@ class CreateBranchRequest(BaseModel):
 
     @field_validator("name")
     @classmethod
-    def validate_name(cls, v: str) -> str:
+    def validate_name(cls, v: str) -> RefName:
         return _validate_ref(v)
 
 
@@ -50,7 +51,7 @@ class BranchActionRequest(BaseModel):
 
     @field_validator("name")
     @classmethod
-    def validate_name(cls, v: str) -> str:
+    def validate_name(cls, v: str) -> RefName:
         return _validate_ref(v)
 
 
@@ -61,39 +62,39 @@ class DeleteBranchRequest(BaseModel):
 
     @field_validator("name")
     @classmethod
-    def validate_name(cls, v: str) -> str:
+    def validate_name(cls, v: str) -> RefName:
         return _validate_ref(v)
 
 
-@router.get("", response_model=list[BranchOut])
-async def branches(repo_path: Optional[str] = Query(None)):
-    return [BranchOut(**b.__dict__) for b in list_branches(repo_path)]
+@router.get("", responses={200: {"model": list[BranchOut]}})
+def branches(repo_path: Optional[str] = Query(None)):
+    return ORJSONResponse(list_branches(repo_path))
 
 
 @router.post("")
-async def create(req: CreateBranchRequest):
+def create(req: CreateBranchRequest):
     create_branch(req.name, req.checkout, req.repo_path)
     return {"ok": True}
 
 
 @router.post("/checkout")
-async def checkout(req: BranchActionRequest):
+def checkout(req: BranchActionRequest):
     checkout_branch(req.name, req.repo_path)
     return {"ok": True}
 
 
 @router.delete("")
-async def delete(req: DeleteBranchRequest):
+def delete(req: DeleteBranchRequest):
     delete_branch(req.name, req.force, req.repo_path)
     return {"ok": True}
 
 
 @router.post("/merge")
-async def merge(req: BranchActionRequest):
+def merge(req: BranchActionRequest):
     output = merge_branch(req.name, req.repo_path)
     return {"output": output}
 
 
 @router.get("/graph")
-async def graph(repo_path: Optional[str] = Query(None)):
-    return get_branch_graph(repo_path)
\ No newline at end of file
+def graph(repo_path: Optional[str] = Query(None)):
+    return ORJSONResponse(get_branch_graph(repo_path))
\ No newline at end of file
@@ -3,6 +3,7 @@
 from typing import Optional
 
 from fastapi import APIRouter, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, field_validator
 
 from app.services.commit_service import Commit, create_commit, get_log
@@ -35,16 +36,16 @@ class CommitOut(BaseModel):
 
 
 @router.post("")
-async def commit(req: CommitRequest):
+def commit(req: CommitRequest):
     sha = create_commit(req.message, req.repo_path)
     return {"sha": sha}
 
 
-@router.get("/log", response_model=list[CommitOut])
-async def log(
+@router.get("/log", responses={200: {"model": list[CommitOut]}})
+def log(
     limit: int = Query(30, ge=1, le=200),
     branch: Optional[str] = Query(None),
     repo_path: Optional[str] = Query(None),
 ):
     commits = get_log(limit=limit, branch=branch, repo_path=repo_path)
-    return [CommitOut(**c.__dict__) for c in commits]
\ No newline at end of file
+    return ORJSONResponse(commits)
\ No newline at end of file
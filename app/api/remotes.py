@@ -3,6 +3,7 @@
 from typing import Optional
 
 from fastapi import APIRouter, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, field_validator
 
 from app.services.remote_service import fetch, list_remotes, pull, push
@@ -24,23 +25,23 @@ class RemoteActionRequest(BaseModel):
 
 
 @router.get("")
-async def remotes(repo_path: Optional[str] = Query(None)):
-    return [r.__dict__ for r in list_remotes(repo_path)]
+def remotes(repo_path: Optional[str] = Query(None)):
+    return ORJSONResponse(list_remotes(repo_path))
 
 
 @router.post("/fetch")
-async def do_fetch(req: RemoteActionRequest):
+def do_fetch(req: RemoteActionRequest):
     output = fetch(req.remote, req.repo_path)
     return {"output": output}
 
 
 @router.post("/pull")
-async def do_pull(req: RemoteActionRequest):
+def do_pull(req: RemoteActionRequest):
     output = pull(req.remote, req.branch, req.repo_path)
     return {"output": output}
 
 
 @router.post("/push")
-async def do_push(req: RemoteActionRequest):
+def do_push(req: RemoteActionRequest):
     output = push(req.remote, req.branch, req.repo_path)
     return {"output": output}
\ No newline at end of file
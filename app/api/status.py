@@ -3,11 +3,12 @@
 from typing import Annotated, Optional
 
 from fastapi import APIRouter, Body, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, field_validator
 
 from app.services.status_service import (
-    FileStatus,
-    RepoStatus,
+    _validate_path,
+    get_overview,
     get_staged_diff,
     get_status,
     stage_all,
@@ -25,9 +26,7 @@ class FileActionRequest(BaseModel):
     @field_validator("file_path")
     @classmethod
     def validate_file_path(cls, v: str) -> str:
-        if not v or v.startswith("-") or "\x00" in v or ".." in v:
-            raise ValueError("Invalid file path.")
-        return v
+        return _validate_path(v)
 
 
 class FileStatusOut(BaseModel):
@@ -47,48 +46,42 @@ class RepoStatusOut(BaseModel):
     untracked: list[FileStatusOut]
 
 
-def _file_out(f: FileStatus) -> FileStatusOut:
-    return FileStatusOut(
-        path=f.path,
-        index_status=f.index_status,
-        work_status=f.work_status,
-        is_staged=f.is_staged,
-        is_unstaged=f.is_unstaged,
-    )
+class StatusOverviewOut(BaseModel):
+    status: RepoStatusOut
+    staged_diff: str
+    unstaged_diff: str
 
 
-@router.get("", response_model=RepoStatusOut)
-async def repo_status(repo_path: Optional[str] = Query(None)):
-    status = get_status(repo_path)
-    return RepoStatusOut(
-        branch=status.branch,
-        ahead=status.ahead,
-        behind=status.behind,
-        staged=[_file_out(f) for f in status.staged],
-        unstaged=[_file_out(f) for f in status.unstaged],
-        untracked=[_file_out(f) for f in status.untracked],
-    )
+@router.get("", responses={200: {"model": RepoStatusOut}})
+def repo_status(repo_path: Optional[str] = Query(None)):
+    return ORJSONResponse(get_status(repo_path))
+
+
+@router.get("/overview", responses={200: {"model": StatusOverviewOut}})
+def repo_overview(repo_path: Optional[str] = Query(None)):
+    """Status plus staged and unstaged diffs, gathered concurrently."""
+    return ORJSONResponse(get_overview(repo_path))
 
 
 @router.post("/stage")
-async def stage(req: FileActionRequest):
+def stage(req: FileActionRequest):
     stage_file(req.file_path, req.repo_path)
     return {"ok": True}
 
 
 @router.post("/unstage")
-async def unstage(req: FileActionRequest):
+def unstage(req: FileActionRequest):
     unstage_file(req.file_path, req.repo_path)
     return {"ok": True}
 
 
 @router.post("/stage-all")
-async def stage_all_files(repo_path: Optional[str] = Body(None, embed=True)):
+def stage_all_files(repo_path: Optional[str] = Body(None, embed=True)):
     stage_all(repo_path)
     return {"ok": True}
 
 
 @router.get("/diff")
-async def staged_diff(repo_path: Optional[str] = Query(None)):
+def staged_diff(repo_path: Optional[str] = Query(None)):
     diff = get_staged_diff(repo_path)
     return {"diff": diff}
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Short-lived in-process caches for read-only git queries.
+
+Callers key entries with git_runner.repo_state_key(), which includes a
+per-repo generation counter bumped after every command that may change the
+repository. The counter lives in this process, so writes made through this
+server process are visible immediately. Changes made elsewhere, whether
+from a terminal or another uvicorn worker, show up once the TTL expires
+unless they also move HEAD.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """A small thread-safe mapping whose entries expire after `ttl` seconds."""
+
+    def __init__(self, ttl: float, maxsize: int = 64):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            with self._lock:
+                self._data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                for k in [k for k, (exp, _) in self._data.items() if exp < now]:
+                    del self._data[k]
+                if len(self._data) >= self.maxsize:
+                    # Dicts keep insertion order, so the first key is the oldest.
+                    del self._data[next(iter(self._data))]
+            self._data[key] = (now + self.ttl, value)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, calling compute() on a miss.
+        Concurrent misses for the same key share a single compute() call: the
+        first caller runs it and the others wait on its result.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
@@ -19,11 +19,15 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        frozen=True,
     )
 
     # Server
     PORT: int = 8000
     DEBUG: bool = False
+    UVICORN_LOOP: str = "auto"  # "auto" picks uvloop when installed; override with "uvloop"/"asyncio"
+    UVICORN_HTTP: str = "auto"  # "auto" picks httptools when installed; override with "httptools"/"h11"
+    UVICORN_WORKERS: int = 1  # 0 = one per CPU. Read caches are per process; see app.core.cache
 
     # AI
     GEMINI_API_KEY: str = ""
@@ -52,4 +56,6 @@ def get_settings() -> Settings:
     return Settings()
 
 
+# Built once at import. Application code reads attributes off this instance
+# directly rather than going through get_settings() on each request.
 settings = get_settings()
\ No newline at end of file
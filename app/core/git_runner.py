@@ -11,8 +11,12 @@ import logging
 import os
 import shlex
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from app.core.config import settings
 from app.core.exceptions import GitCommandError, InvalidPathError, RepoNotFoundError
@@ -20,80 +24,396 @@ from app.core.exceptions import GitCommandError, InvalidPathError, RepoNotFoundE
 logger = logging.getLogger(__name__)
 
 _GIT_TIMEOUT = 30  # seconds
+_RESOLVE_TTL = 5  # seconds a resolved repo path is trusted before re-checking it exists
+
+# Subcommands that never change repository state. Any other command bumps the
+# repo's generation counter, which invalidates cached reads keyed on it.
+_READ_ONLY_COMMANDS = frozenset(
+    {"status", "log", "for-each-ref", "remote", "diff", "rev-parse", "cat-file"}
+)
+
+_generations: dict[Path, int] = {}
+_generations_lock = threading.Lock()
+
+
+# Explicitly inherit a clean, minimal environment to avoid leaking sensitive
+# variables from the parent process. Built once; subprocess never mutates it.
+_GIT_ENV = {
+    "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+    "HOME": os.environ.get("HOME", "/root"),
+    "GIT_TERMINAL_PROMPT": "0",  # Never prompt for credentials
+}
+
+
+@lru_cache(maxsize=64)
+def _resolve_repo_cached(raw: str, _ttl_bucket: int) -> Path:
+    resolved = Path(raw).resolve()
+
+    if not resolved.exists():
+        raise InvalidPathError(f"Path does not exist: {resolved}")
+
+    # Verify it's actually a git repo root (a linked worktree's .git is a file).
+    # Subdirectories are refused: status paths are root-relative, so they must
+    # be passed back to `git -C <root>`.
+    if not (resolved / ".git").exists():
+        raise RepoNotFoundError()
+
+    return resolved
 
 
 def _resolve_repo(repo_path: Optional[str] = None) -> Path:
     """
     Resolve and validate a repository path.
     Prevents path traversal by ensuring the resolved path stays within an allowed root.
+
+    Results are cached per raw path; the time bucket in the cache key forces a
+    fresh resolve + existence check every _RESOLVE_TTL seconds so a deleted
+    repo is noticed. Failures are never cached.
     """
     raw = repo_path or settings.DEFAULT_REPO_PATH
-    resolved = Path(raw).resolve()
+    return _resolve_repo_cached(raw, int(time.monotonic() // _RESOLVE_TTL))
 
-    if not resolved.exists():
-        raise InvalidPathError(f"Path does not exist: {resolved}")
 
-    # Verify it's actually a git repo
-    git_dir = resolved / ".git"
-    if not git_dir.exists():
-        raise RepoNotFoundError()
+@lru_cache(maxsize=64)
+def _index_file(repo: Path) -> Path:
+    dot_git = repo / ".git"
+    if dot_git.is_file():
+        # Linked worktree or submodule: .git holds "gitdir: <path>".
+        content = dot_git.read_text().strip()
+        if content.startswith("gitdir:"):
+            return (repo / content[len("gitdir:"):].strip()) / "index"
+    return dot_git / "index"
+
+
+def index_path(repo_path: Optional[str] = None) -> Path:
+    """Return the path of the repository's index file."""
+    return _index_file(_resolve_repo(repo_path))
 
-    return resolved
+
+def _git_error(message: str, stderr: str) -> GitCommandError | RepoNotFoundError:
+    """Map a failed git invocation to the matching application exception."""
+    if "not a git repository" in stderr:
+        return RepoNotFoundError()
+    return GitCommandError(message=message, stderr=stderr)
 
 
 def run_git(
     args: list[str],
     repo_path: Optional[str] = None,
     capture_stderr: bool = True,
-) -> str:
+    binary: bool = False,
+    max_bytes: Optional[int] = None,
+) -> str | bytes:
     """
-    Run a git command and return stdout as a string.
+    Run a git command and return its stdout: a string, or bytes if binary=True.
 
     Args:
         args: Git subcommand and flags, e.g. ["status", "--short"].
         repo_path: Repository directory. Defaults to settings.DEFAULT_REPO_PATH.
         capture_stderr: Whether to capture stderr (useful for diff/log).
+        binary: Return stdout as raw bytes, skipping decoding and newline
+            translation (for NUL-delimited output such as `status -z`).
+        max_bytes: Stop reading after this many bytes of stdout. At most
+            max_bytes + 1 bytes are returned, so callers can tell the output
+            was cut; git itself is stopped instead of running to completion.
 
     Raises:
         GitCommandError: If git exits with a non-zero code.
         InvalidPathError: If the path is unsafe.
-        RepoNotFoundError: If the path has no .git directory.
+        RepoNotFoundError: If the path is not the root of a git repository.
     """
     cwd = _resolve_repo(repo_path)
     cmd = ["git", "-C", str(cwd)] + args
 
-    logger.debug("Running: %s", shlex.join(cmd))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Running: %s", shlex.join(cmd))
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=_GIT_TIMEOUT,
-            # Explicitly inherit a clean, minimal environment to avoid leaking
-            # sensitive variables from the parent process.
-            env={
-                "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
-                "HOME": os.environ.get("HOME", "/root"),
-                "GIT_TERMINAL_PROMPT": "0",  # Never prompt for credentials
-            },
-        )
+        if max_bytes is None:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=not binary,
+                timeout=_GIT_TIMEOUT,
+                env=_GIT_ENV,
+            )
+        else:
+            result = _run_capped(cmd, max_bytes)
+            if not binary:
+                result.stdout = result.stdout.decode("utf-8", "replace")
+                result.stderr = result.stderr.decode("utf-8", "replace")
     except subprocess.TimeoutExpired:
         raise GitCommandError("Git command timed out.", stderr="")
     except FileNotFoundError:
         raise GitCommandError("git executable not found. Is git installed?")
+    finally:
+        # Bump even on failure: e.g. a conflicting merge still changes the worktree.
+        if args and args[0] not in _READ_ONLY_COMMANDS:
+            with _generations_lock:
+                _generations[cwd] = _generations.get(cwd, 0) + 1
 
     if result.returncode != 0:
-        stderr = result.stderr.strip()
+        stderr = result.stderr
+        if binary:
+            stderr = stderr.decode("utf-8", "replace")
+        stderr = stderr.strip()
         logger.warning("Git error (exit %d): %s", result.returncode, stderr)
-        raise GitCommandError(
-            message=f"Git command failed: {' '.join(args[:2])}",
-            stderr=stderr,
-        )
+        raise _git_error(f"Git command failed: {' '.join(args[:2])}", stderr)
 
     return result.stdout
 
 
+class _Deadline:
+    """
+    Kill a git process still running after _GIT_TIMEOUT seconds.
+
+    For pipes read incrementally, where subprocess.run(timeout=...) does not
+    apply: the kill closes git's end, so a blocked read returns and the caller
+    checks `expired`.
+    """
+
+    def __init__(self, proc: subprocess.Popen, timeout: Optional[float] = None):
+        self.expired = False
+        self._proc = proc
+        self._timer = threading.Timer(timeout or _GIT_TIMEOUT, self._expire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _expire(self) -> None:
+        self.expired = True
+        self._proc.kill()
+
+    def cancel(self) -> None:
+        self._timer.cancel()
+
+
+def _run_capped(cmd: list[str], max_bytes: int) -> subprocess.CompletedProcess:
+    """
+    Run cmd, reading at most max_bytes + 1 bytes of stdout.
+
+    If the output is longer, the pipe is closed early; git then exits on
+    SIGPIPE, which is not treated as a failure. Peak memory stays at the cap
+    however large the real output is.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=_GIT_ENV,
+    )
+    deadline = _Deadline(proc)
+    try:
+        stdout = proc.stdout.read(max_bytes + 1)
+        truncated = len(stdout) > max_bytes
+        proc.stdout.close()  # Unread output now gets git a SIGPIPE.
+        stderr = proc.stderr.read()
+        returncode = proc.wait()
+    finally:
+        deadline.cancel()
+        proc.stdout.close()
+        proc.stderr.close()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+    if deadline.expired:
+        raise subprocess.TimeoutExpired(cmd, _GIT_TIMEOUT)
+    if truncated:
+        returncode = 0
+    return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+
+
+def run_git_lines(args: list[str], repo_path: Optional[str] = None) -> Iterator[str]:
+    """
+    Run a git command and yield its stdout one line at a time (newline stripped).
+
+    Unlike run_git, the output is never buffered into a single string, so
+    callers can build their results in one pass as git produces them.
+    Errors are raised once the output is exhausted, same as run_git.
+    """
+    cwd = _resolve_repo(repo_path)
+    cmd = ["git", "-C", str(cwd)] + args
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Running: %s", shlex.join(cmd))
+
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=-1,
+            env=_GIT_ENV,
+        )
+    except FileNotFoundError:
+        raise GitCommandError("git executable not found. Is git installed?")
+
+    deadline = _Deadline(proc)
+    try:
+        for line in proc.stdout:
+            yield line.rstrip("\n")
+        stderr = proc.stderr.read().strip()
+        returncode = proc.wait()
+    finally:
+        # Also reached when the consumer stops iterating early.
+        deadline.cancel()
+        proc.stdout.close()
+        proc.stderr.close()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    if deadline.expired:
+        raise GitCommandError("Git command timed out.", stderr="")
+    if returncode != 0:
+        logger.warning("Git error (exit %d): %s", returncode, stderr)
+        raise _git_error(f"Git command failed: {' '.join(args[:2])}", stderr)
+
+
+class _GitWorker:
+    """
+    A long-running `git cat-file --batch-check` process bound to one repository.
+
+    Revisions are written to its stdin one per line and answered with
+    "<sha> <type> <size>" (or "<rev> missing"), so repeated lookups such as
+    resolving HEAD cost a pipe round-trip instead of a fresh fork+exec.
+    """
+
+    def __init__(self, repo: Path):
+        self.repo = repo
+        self.timed_out = False
+        self._lock = threading.Lock()
+        self._proc = subprocess.Popen(
+            ["git", "-C", str(repo), "cat-file", "--batch-check"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            env=_GIT_ENV,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """Return the full object name for rev, or None if it does not resolve."""
+        with self._lock:
+            deadline = _Deadline(self._proc)
+            try:
+                self._proc.stdin.write(rev + "\n")
+                self._proc.stdin.flush()
+                line = self._proc.stdout.readline()
+            except (BrokenPipeError, ValueError):
+                line = ""
+            finally:
+                deadline.cancel()
+        if deadline.expired:
+            self.timed_out = True
+            raise GitCommandError("Git command timed out.", stderr="")
+        if not line:
+            self._proc.wait()
+            raise _git_error("Git worker process exited unexpectedly.", self._proc.stderr.read())
+        parts = line.split()
+        return parts[0] if len(parts) == 3 else None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._proc.stdin:
+                try:
+                    self._proc.stdin.close()
+                except OSError:
+                    # Flushing a failed write into a pipe git already closed.
+                    pass
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+            for stream in (self._proc.stdout, self._proc.stderr):
+                if stream:
+                    stream.close()
+
+
+# Least recently used first. repo_path comes from the client, so the number of
+# live worker processes is capped and the oldest one is closed to make room.
+_MAX_WORKERS = 16
+_workers: OrderedDict[Path, _GitWorker] = OrderedDict()
+_workers_lock = threading.Lock()
+
+
+def _get_worker(repo: Path) -> _GitWorker:
+    evicted = None
+    with _workers_lock:
+        worker = _workers.get(repo)
+        if worker is not None and worker.alive:
+            _workers.move_to_end(repo)
+            return worker
+        if worker is not None:
+            worker.close()
+        try:
+            worker = _GitWorker(repo)
+        except FileNotFoundError:
+            raise GitCommandError("git executable not found. Is git installed?")
+        _workers[repo] = worker
+        _workers.move_to_end(repo)
+        if len(_workers) > _MAX_WORKERS:
+            _, evicted = _workers.popitem(last=False)
+    if evicted is not None:
+        # Outside the registry lock: close() waits for a lookup in progress.
+        evicted.close()
+    return worker
+
+
+def _discard_worker(repo: Path, worker: _GitWorker) -> None:
+    with _workers_lock:
+        if _workers.get(repo) is worker:
+            del _workers[repo]
+    worker.close()
+
+
+def resolve_rev(rev: str, repo_path: Optional[str] = None) -> Optional[str]:
+    """
+    Resolve a revision (e.g. "HEAD", a branch name) to a full SHA through the
+    repository's persistent worker. Returns None if the revision does not exist.
+    """
+    if not rev or "\n" in rev or rev.startswith("-"):
+        raise ValueError(f"Invalid revision: {rev!r}")
+    repo = _resolve_repo(repo_path)
+    for attempt in range(2):
+        worker = _get_worker(repo)
+        try:
+            return worker.resolve(rev)
+        except (GitCommandError, RepoNotFoundError):
+            # The worker died (e.g. repo removed or git killed): drop it and
+            # retry once on a fresh one, unless it hung and was killed.
+            _discard_worker(repo, worker)
+            if attempt or worker.timed_out:
+                raise
+
+
+def repo_state_key(repo_path: Optional[str] = None) -> tuple:
+    """
+    Return a hashable token for the repository's current state, for keying
+    caches of read-only queries: (resolved path, generation, HEAD sha).
+
+    The generation changes whenever GitSage runs a mutating git command; the
+    HEAD sha also catches commits and checkouts made outside GitSage.
+    """
+    repo = _resolve_repo(repo_path)
+    return (repo, _generations.get(repo, 0), resolve_rev("HEAD", str(repo)))
+
+
+def close_workers() -> None:
+    """Terminate all persistent git workers. Called on application shutdown."""
+    with _workers_lock:
+        workers = list(_workers.values())
+        _workers.clear()
+    for worker in workers:
+        worker.close()
+
+
 def get_repo_root(repo_path: Optional[str] = None) -> str:
     """Return the absolute root of the git repository."""
     return run_git(["rev-parse", "--show-toplevel"], repo_path).strip()
@@ -102,7 +422,7 @@ def get_repo_root(repo_path: Optional[str] = None) -> str:
 def is_repo(path: str) -> bool:
     """Check whether a directory is a git repo without raising."""
     try:
-        _resolve_repo(path)
+        run_git(["rev-parse", "--git-dir"], path)
         return True
-    except (RepoNotFoundError, InvalidPathError):
+    except (RepoNotFoundError, InvalidPathError, GitCommandError):
         return False
\ No newline at end of file
@@ -9,13 +9,16 @@ Security notes:
 
 import logging
 import re
-from typing import Optional
-
-import httpx
+from typing import TYPE_CHECKING, Optional
 
 from app.core.config import settings
 from app.core.exceptions import AINotConfiguredError, AIServiceError
 
+# httpx (with h2) is imported on first use: without a GEMINI_API_KEY it is
+# never needed, and it is a noticeable share of app startup time.
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
 _GEMINI_API_URL = (
@@ -46,11 +49,57 @@ Keep your response concise and practical. Never suggest force-pushing to shared
 """
 
 
-async def _call_gemini(prompt: str, system_prompt: str) -> str:
-    """Make a single call to the Gemini generateContent API."""
+_FENCE_OPEN_RE = re.compile(r"^```[a-z]*\n?", re.MULTILINE)
+_FENCE_CLOSE_RE = re.compile(r"\n?```$", re.MULTILINE)
+_STEP_RE = re.compile(r"^\d+\.\s*")
+
+_client: Optional["httpx.AsyncClient"] = None
+
+
+def open_client() -> "httpx.AsyncClient":
+    """
+    Create the shared Gemini HTTP client. Called from the application lifespan;
+    _get_client() falls back to it lazily when used outside the app.
+
+    Reusing one HTTP/2 client keeps a single multiplexed, kept-alive
+    connection to Google instead of a TCP+TLS handshake per request.
+    """
+    import httpx
+
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=settings.AI_REQUEST_TIMEOUT,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30),
+        )
+    return _client
+
+
+def _get_client() -> "httpx.AsyncClient":
+    if _client is None or _client.is_closed:
+        return open_client()
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client. Called on application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def ensure_configured() -> None:
+    """Raise AINotConfiguredError early, before doing any work for an AI request."""
     if not settings.gemini_configured:
         raise AINotConfiguredError()
 
+
+async def _call_gemini(prompt: str, system_prompt: str) -> str:
+    """Make a single call to the Gemini generateContent API."""
+    ensure_configured()
+
     url = _GEMINI_API_URL.format(model=settings.GEMINI_MODEL, key=settings.GEMINI_API_KEY)
 
     payload = {
@@ -62,9 +111,11 @@ async def _call_gemini(prompt: str, system_prompt: str) -> str:
         },
     }
 
+    client = _get_client()
+    import httpx  # Already loaded by _get_client().
+
     try:
-        async with httpx.AsyncClient(timeout=settings.AI_REQUEST_TIMEOUT) as client:
-            response = await client.post(url, json=payload)
+        response = await client.post(url, json=payload)
     except httpx.TimeoutException:
         raise AIServiceError("Gemini request timed out.")
     except httpx.RequestError as exc:
@@ -95,8 +146,8 @@ async def generate_commit_message(diff: str) -> str:
     prompt = f"Git diff to summarize:\n\n```diff\n{diff}\n```"
     raw = await _call_gemini(prompt, _COMMIT_SYSTEM_PROMPT)
 
-    clean = re.sub(r"^```[a-z]*\n?", "", raw, flags=re.MULTILINE)
-    clean = re.sub(r"\n?```$", "", clean, flags=re.MULTILINE)
+    clean = _FENCE_OPEN_RE.sub("", raw)
+    clean = _FENCE_CLOSE_RE.sub("", clean)
     return clean.strip()
 
 
@@ -133,9 +184,9 @@ async def diagnose_error(error_output: str, context: Optional[str] = None) -> di
     steps_raw = paragraphs[1] if len(paragraphs) > 1 else ""
 
     steps = [
-        re.sub(r"^\d+\.\s*", "", line).strip()
+        _STEP_RE.sub("", line).strip()
         for line in steps_raw.splitlines()
-        if re.match(r"^\d+\.", line.strip())
+        if _STEP_RE.match(line.strip())
     ]
 
     return {
@@ -156,11 +207,10 @@ _SAFE_AUTO_FIX_PATTERNS = [
     r"^git reset HEAD~1$",
     r"^git restore --staged \.$",
 ]
+_SAFE_AUTO_FIX_RES = tuple(re.compile(p) for p in _SAFE_AUTO_FIX_PATTERNS)
 
 
 def _is_safe_auto_fix(cmd: str) -> bool:
     """Whitelist check for auto-fix commands to prevent executing dangerous git ops."""
-    for pattern in _SAFE_AUTO_FIX_PATTERNS:
-        if re.fullmatch(pattern, cmd.strip()):
-            return True
-    return False
\ No newline at end of file
+    cmd = cmd.strip()
+    return any(r.fullmatch(cmd) for r in _SAFE_AUTO_FIX_RES)
\ No newline at end of file
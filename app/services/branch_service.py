@@ -1,5 +1,8 @@
 """
 Service layer for branch operations.
+
+Branch names arrive as RefName: they are validated once by the API request
+models and are not re-checked here.
 """
 
 import logging
@@ -7,13 +10,24 @@ import re
 from dataclasses import dataclass
 from typing import Optional
 
-from app.core.git_runner import run_git
-from app.services.commit_service import _is_valid_ref_name
+from app.core.cache import TTLCache
+from app.core.git_runner import repo_state_key, run_git, run_git_lines
+from app.services.commit_service import RefName
 
 logger = logging.getLogger(__name__)
 
+_SEP = "\x1f"
+_BRANCH_FORMAT = _SEP.join(["%(refname:short)", "%(HEAD)", "%(objectname:short)", "%(subject)"])
+_BRANCH_RE = re.compile(_SEP.join([r"([^\x1f]*)"] * 4))
+
+_GRAPH_FORMAT = _SEP.join(["%h", "%s", "%an", "%ci", "%D"])
+_GRAPH_RE = re.compile(_SEP.join([r"([^\x1f]*)"] * 5))
+
+_branch_cache = TTLCache(ttl=1.5)
+_graph_cache = TTLCache(ttl=1.5)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Branch:
     name: str
     is_current: bool
@@ -24,56 +38,40 @@ class Branch:
 
 def list_branches(repo_path: Optional[str] = None) -> list[Branch]:
     """Return all local branches with their last commit info."""
-    sep = "\x1f"
-    fmt = sep.join(["%(refname:short)", "%(HEAD)", "%(objectname:short)", "%(subject)"])
+    return _branch_cache.get_or_compute(repo_state_key(repo_path), lambda: _load_branches(repo_path))
+
 
-    raw = run_git(["for-each-ref", f"--format={fmt}", "refs/heads/"], repo_path)
+def _load_branches(repo_path: Optional[str]) -> list[Branch]:
+    lines = run_git_lines(["for-each-ref", f"--format={_BRANCH_FORMAT}", "refs/heads/"], repo_path)
     branches = []
-    for line in raw.splitlines():
-        parts = line.split(sep)
-        if len(parts) != 4:
-            continue
-        branches.append(
-            Branch(
-                name=parts[0],
-                is_current=parts[1] == "*",
-                is_remote=False,
-                last_commit_sha=parts[2],
-                last_commit_message=parts[3],
-            )
-        )
+    for m in map(_BRANCH_RE.fullmatch, lines):
+        if m:
+            name, head, sha, subject = m.groups()
+            branches.append(Branch(name, head == "*", False, sha, subject))
     return branches
 
 
-def create_branch(name: str, checkout: bool = True, repo_path: Optional[str] = None) -> None:
+def create_branch(name: RefName, checkout: bool = True, repo_path: Optional[str] = None) -> None:
     """Create (and optionally check out) a new branch."""
-    if not _is_valid_ref_name(name):
-        raise ValueError(f"Invalid branch name: {name!r}")
     if checkout:
         run_git(["checkout", "-b", name], repo_path)
     else:
         run_git(["branch", name], repo_path)
 
 
-def checkout_branch(name: str, repo_path: Optional[str] = None) -> None:
+def checkout_branch(name: RefName, repo_path: Optional[str] = None) -> None:
     """Switch to an existing branch."""
-    if not _is_valid_ref_name(name):
-        raise ValueError(f"Invalid branch name: {name!r}")
     run_git(["checkout", name], repo_path)
 
 
-def delete_branch(name: str, force: bool = False, repo_path: Optional[str] = None) -> None:
+def delete_branch(name: RefName, force: bool = False, repo_path: Optional[str] = None) -> None:
     """Delete a local branch."""
-    if not _is_valid_ref_name(name):
-        raise ValueError(f"Invalid branch name: {name!r}")
     flag = "-D" if force else "-d"
     run_git(["branch", flag, name], repo_path)
 
 
-def merge_branch(source: str, repo_path: Optional[str] = None) -> str:
+def merge_branch(source: RefName, repo_path: Optional[str] = None) -> str:
     """Merge source branch into the current branch. Returns git output."""
-    if not _is_valid_ref_name(source):
-        raise ValueError(f"Invalid branch name: {source!r}")
     return run_git(["merge", "--no-ff", source], repo_path)
 
 
@@ -82,25 +80,25 @@ def get_branch_graph(repo_path: Optional[str] = None) -> list[dict]:
     Return a simplified commit graph suitable for UI rendering.
     Each entry has sha, message, author, date, and refs.
     """
-    sep = "\x1f"
-    fmt = sep.join(["%h", "%s", "%an", "%ci", "%D"])
-    raw = run_git(
-        ["log", "--all", "--decorate=short", f"--format={fmt}", "--max-count=100"],
+    return _graph_cache.get_or_compute(repo_state_key(repo_path), lambda: _load_graph(repo_path))
+
+
+def _load_graph(repo_path: Optional[str]) -> list[dict]:
+    lines = run_git_lines(
+        ["log", "--all", "--decorate=short", f"--format={_GRAPH_FORMAT}", "--max-count=100"],
         repo_path,
     )
     graph = []
-    for line in raw.splitlines():
-        parts = line.split(sep)
-        if len(parts) != 5:
-            continue
-        refs = [r.strip() for r in parts[4].split(",") if r.strip()]
-        graph.append(
-            {
-                "sha": parts[0],
-                "message": parts[1],
-                "author": parts[2],
-                "date": parts[3],
-                "refs": refs,
-            }
-        )
+    for m in map(_GRAPH_RE.fullmatch, lines):
+        if m:
+            sha, message, author, date, refs = m.groups()
+            graph.append(
+                {
+                    "sha": sha,
+                    "message": message,
+                    "author": author,
+                    "date": date,
+                    "refs": [r.strip() for r in refs.split(",") if r.strip()],
+                }
+            )
     return graph
\ No newline at end of file
@@ -5,16 +5,31 @@ Service layer for git commit operations and commit log.
 import logging
 import re
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import NewType, Optional
 
-from app.core.git_runner import run_git
+from app.core.cache import TTLCache
+from app.core.git_runner import repo_state_key, run_git, run_git_lines
 
 logger = logging.getLogger(__name__)
 
-_SAFE_MESSAGE_PATTERN = re.compile(r"^[\w\s\(\):\-/\.,!#\[\]'\"@&+=<>_]+$", re.UNICODE)
+# str.translate deletion table: null bytes and control characters, except newline and tab
+_CTRL_TABLE = dict.fromkeys([*range(0x00, 0x09), *range(0x0B, 0x20), 0x7F])
 
+# First line of `git commit` output: "[main 1a2b3c4] subject" or
+# "[main (root-commit) 1a2b3c4] subject".
+_COMMIT_SUMMARY_RE = re.compile(r"^\[[^\]]* ([0-9a-f]{4,})\]", re.MULTILINE)
 
-@dataclass
+_SEP = "\x1f"  # Unit separator — unlikely to appear in git data
+_LOG_FORMAT = _SEP.join(["%H", "%h", "%an", "%ae", "%ci", "%s"])
+# Full-matches a well-formed log line; lines with a stray separator are skipped.
+_LOG_RE = re.compile(_SEP.join([r"([^\x1f]*)"] * 6))
+
+
+_log_cache = TTLCache(ttl=1.5)
+
+
+@dataclass(slots=True, frozen=True)
 class Commit:
     sha: str
     short_sha: str
@@ -29,8 +44,7 @@ def _sanitize_commit_message(message: str) -> str:
     Strip control characters from commit messages.
     This is a defence-in-depth measure; the AI output should already be clean.
     """
-    # Remove null bytes and control characters except newline/tab
-    cleaned = re.sub(r"[\x00-\x08\x0b-\x1f\x7f]", "", message)
+    cleaned = message.translate(_CTRL_TABLE)
     return cleaned.strip()
 
 
@@ -46,10 +60,14 @@ def create_commit(message: str, repo_path: Optional[str] = None) -> str:
         raise ValueError("Commit message exceeds maximum length of 4096 characters.")
 
     # Pass message via -m; git receives it as a single argument, no shell expansion
-    run_git(["commit", "-m", clean_message], repo_path)
+    output = run_git(["commit", "-m", clean_message], repo_path)
 
-    sha = run_git(["rev-parse", "--short", "HEAD"], repo_path).strip()
-    return sha
+    # The summary line already carries the abbreviated SHA; only fall back to a
+    # second git call if its format is ever unrecognised.
+    match = _COMMIT_SUMMARY_RE.search(output)
+    if match:
+        return match.group(1)
+    return run_git(["rev-parse", "--short", "HEAD"], repo_path).strip()
 
 
 def get_log(
@@ -60,38 +78,35 @@ def get_log(
     """Retrieve the commit log."""
     limit = min(max(1, limit), 200)  # Clamp to sane range
 
-    sep = "\x1f"  # Unit separator — unlikely to appear in git data
-    fmt = sep.join(["%H", "%h", "%an", "%ae", "%ci", "%s"])
-
-    args = ["log", f"--format={fmt}", f"-{limit}"]
+    args = ["log", f"--format={_LOG_FORMAT}", f"-{limit}"]
     if branch:
         # Validate branch name before using it as an argument
         if not _is_valid_ref_name(branch):
             raise ValueError(f"Invalid branch name: {branch!r}")
         args.append(branch)
 
-    raw = run_git(args, repo_path)
-    commits = []
-    for line in raw.splitlines():
-        parts = line.split(sep)
-        if len(parts) != 6:
-            continue
-        commits.append(
-            Commit(
-                sha=parts[0],
-                short_sha=parts[1],
-                author=parts[2],
-                email=parts[3],
-                date=parts[4],
-                message=parts[5],
-            )
-        )
-    return commits
+    key = (repo_state_key(repo_path), limit, branch)
+    return _log_cache.get_or_compute(key, lambda: _load_log(args, repo_path))
+
+
+def _load_log(args: list[str], repo_path: Optional[str]) -> list[Commit]:
+    matches = map(_LOG_RE.fullmatch, run_git_lines(args, repo_path))
+    return [Commit(*m.groups()) for m in matches if m]
+
+
+# A branch/ref name that has already passed _is_valid_ref_name (the API request
+# models validate once; services accepting a RefName do not re-check).
+RefName = NewType("RefName", str)
+
+_FORBIDDEN_REF_RE = re.compile(r"[ \t\n\x00\\~^:?*\[]|\.\.")
 
 
 def _is_valid_ref_name(name: str) -> bool:
     """Rough check that a branch/ref name is safe to pass to git."""
-    if not name or len(name) > 250:
-        return False
-    forbidden = [" ", "\t", "\n", "\x00", "\\", "..", "~", "^", ":", "?", "*", "["]
-    return not any(c in name for c in forbidden) and not name.startswith("-")
\ No newline at end of file
+    # Length first, uncached, so oversized request strings never become cache keys.
+    return bool(name) and len(name) <= 250 and _ref_name_chars_ok(name)
+
+
+@lru_cache(maxsize=512)
+def _ref_name_chars_ok(name: str) -> bool:
+    return not name.startswith("-") and _FORBIDDEN_REF_RE.search(name) is None
\ No newline at end of file
@@ -3,15 +3,22 @@ Service layer for remote operations (fetch, pull, push).
 """
 
 import logging
+import re
 from dataclasses import dataclass
 from typing import Optional
 
-from app.core.git_runner import run_git
+from app.core.cache import TTLCache
+from app.core.git_runner import repo_state_key, run_git
 
 logger = logging.getLogger(__name__)
 
+_remote_cache = TTLCache(ttl=1.5)
 
-@dataclass
+# `git remote -v` lines: "<name>\t<url> (fetch|push)"
+_REMOTE_RE = re.compile(r"^(\S+)\t(.*) \((fetch|push)\)$", re.MULTILINE)
+
+
+@dataclass(slots=True, frozen=True)
 class Remote:
     name: str
     fetch_url: str
@@ -20,22 +27,17 @@ class Remote:
 
 def list_remotes(repo_path: Optional[str] = None) -> list[Remote]:
     """Return configured remotes."""
+    return _remote_cache.get_or_compute(repo_state_key(repo_path), lambda: _load_remotes(repo_path))
+
+
+def _load_remotes(repo_path: Optional[str]) -> list[Remote]:
     raw = run_git(["remote", "-v"], repo_path)
-    seen: dict[str, dict] = {}
-
-    for line in raw.splitlines():
-        parts = line.split()
-        if len(parts) < 3:
-            continue
-        name, url, direction = parts[0], parts[1], parts[2].strip("()")
-        if name not in seen:
-            seen[name] = {"name": name, "fetch_url": "", "push_url": ""}
-        if direction == "fetch":
-            seen[name]["fetch_url"] = url
-        elif direction == "push":
-            seen[name]["push_url"] = url
-
-    return [Remote(**v) for v in seen.values()]
+    urls: dict[str, list[str]] = {}
+
+    for name, url, direction in _REMOTE_RE.findall(raw):
+        urls.setdefault(name, ["", ""])[direction == "push"] = url
+
+    return [Remote(name, fetch_url, push_url) for name, (fetch_url, push_url) in urls.items()]
 
 
 def fetch(remote: str = "origin", repo_path: Optional[str] = None) -> str:
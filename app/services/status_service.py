@@ -3,31 +3,53 @@ Service layer for git status and staging operations.
 """
 
 import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
 
-from app.core.git_runner import run_git
+from app.core.cache import TTLCache
+from app.core.exceptions import GitSageError, RepoNotFoundError
+from app.core.git_runner import _resolve_repo, index_path, repo_state_key, run_git
 from app.core.config import settings
 
+try:
+    import pygit2
+except ImportError:  # Optional: status falls back to `git status`.
+    pygit2 = None
+
 logger = logging.getLogger(__name__)
 
+# Short TTL: edits to tracked files don't touch the index, so they are only
+# picked up once an entry expires.
+_status_cache = TTLCache(ttl=0.5)
+_diff_cache = TTLCache(ttl=0.5)
+
+# git runs are blocking subprocess calls; get_overview() overlaps its three
+# runs by handing two of them to this pool and running the third itself.
+_overview_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="git-overview")
+
+# Control characters (NUL, newline, ...) never belong in a path we pass to git.
+_PATH_CTRL_RE = re.compile(r"[\x00-\x1f\x7f]")
+
+# "# branch.head <name>" or "# branch.ab +<ahead> -<behind>"; other headers don't match.
+_BRANCH_HEADER_RE = re.compile(rb"# branch\.(?:head (.+)|ab \+(\d+) -(\d+))")
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class FileStatus:
     path: str
     index_status: str   # X in XY format (staged)
     work_status: str    # Y in XY format (unstaged)
-
-    @property
-    def is_staged(self) -> bool:
-        return self.index_status not in ("?", " ", "!")
-
-    @property
-    def is_unstaged(self) -> bool:
-        return self.work_status not in (" ", "!")
+    is_staged: bool     # index_status not in ("?", " ", "!"); set by the parser
+    is_unstaged: bool   # work_status not in (" ", "!"); set by the parser
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RepoStatus:
     branch: str
     ahead: int
@@ -37,47 +59,138 @@ class RepoStatus:
     untracked: list[FileStatus]
 
 
-def _parse_porcelain(output: str) -> list[FileStatus]:
-    files = []
-    for line in output.splitlines():
-        if len(line) < 4:
-            continue
-        x = line[0]
-        y = line[1]
-        # Path starts at index 3; handle renames (-> separator)
-        path_part = line[3:]
-        path = path_part.split(" -> ")[-1]
-        files.append(FileStatus(path=path, index_status=x, work_status=y))
-    return files
+@dataclass(slots=True, frozen=True)
+class StatusOverview:
+    status: RepoStatus
+    staged_diff: str
+    unstaged_diff: str
 
 
-def get_status(repo_path: Optional[str] = None) -> RepoStatus:
-    """Return a structured representation of the current working tree status."""
-    raw = run_git(["status", "--porcelain=v1", "--branch"], repo_path)
-    lines = raw.splitlines()
+def _decode_path(raw: bytes) -> str:
+    # Paths are bytes on disk. "replace" rather than "surrogateescape": lone
+    # surrogates cannot be serialized to JSON, so they could not be shown anyway.
+    return raw.decode("utf-8", "replace")
+
+
+def _parse_and_classify(
+    output: bytes,
+) -> tuple[str, int, int, list[FileStatus], list[FileStatus], list[FileStatus]]:
+    """
+    Parse raw `git status --porcelain=v2 --branch -z` output in a single pass.
+    Returns (branch, ahead, behind, staged, unstaged, untracked).
 
+    Records are NUL-terminated, so paths need no unquoting and never contain an
+    ambiguous " -> ". The output is parsed as bytes and only the path fields
+    are decoded. XY codes use "." for "unmodified"; it is mapped back to the
+    space used by porcelain v1 so the API's status letters are unchanged. Each
+    file is put straight into its bucket(s) as it is parsed; a file with both
+    index and worktree changes lands in staged and unstaged.
+    """
     branch = "unknown"
     ahead = behind = 0
+    staged: list[FileStatus] = []
+    unstaged: list[FileStatus] = []
+    untracked: list[FileStatus] = []
+    staged_append = staged.append
+    unstaged_append = unstaged.append
+
+    records = iter(output.split(b"\x00"))
+    for rec in records:
+        if not rec:
+            continue
+        kind = rec[:1]
+        if kind == b"1":
+            # 1 XY sub mH mI mW hH hI path
+            path = rec.split(b" ", 8)[8]
+        elif kind == b"2":
+            # 2 XY sub mH mI mW hH hI Xscore path, followed by the original path
+            path = rec.split(b" ", 9)[9]
+            next(records, None)
+        elif kind == b"u":
+            # u XY sub m1 m2 m3 mW h1 h2 h3 path
+            path = rec.split(b" ", 10)[10]
+        elif kind == b"?":
+            untracked.append(FileStatus(_decode_path(rec[2:]), "?", "?", False, True))
+            continue
+        elif kind == b"#":
+            m = _BRANCH_HEADER_RE.match(rec)
+            if m:
+                head, a, b = m.groups()
+                if head is not None:
+                    branch = "HEAD (no branch)" if head == b"(detached)" else _decode_path(head)
+                else:
+                    ahead, behind = int(a), int(b)
+            continue
+        else:
+            # Ignored ("!") entries belong to no bucket.
+            continue
+
+        x = chr(rec[2])
+        y = chr(rec[3])
+        if x == ".":
+            x = " "
+        if y == ".":
+            y = " "
+        is_staged = x != " "
+        is_unstaged = y != " "
+        f = FileStatus(_decode_path(path), x, y, is_staged, is_unstaged)
+        if is_staged:
+            staged_append(f)
+        if is_unstaged:
+            unstaged_append(f)
+
+    return branch, ahead, behind, staged, unstaged, untracked
+
+
+def _index_mtime(repo_path: Optional[str]) -> int:
+    """mtime of the index file, so staging done outside GitSage invalidates the cache."""
+    try:
+        return os.stat(index_path(repo_path)).st_mtime_ns
+    except OSError:
+        return 0
+
 
-    if lines and lines[0].startswith("## "):
-        header = lines[0][3:]
-        # Format: "main...origin/main [ahead N, behind M]"
-        parts = header.split("...")
-        branch = parts[0]
-        if "[" in header:
-            info = header[header.index("[") + 1 : header.index("]")]
-            for segment in info.split(","):
-                segment = segment.strip()
-                if segment.startswith("ahead"):
-                    ahead = int(segment.split()[-1])
-                elif segment.startswith("behind"):
-                    behind = int(segment.split()[-1])
-
-    all_files = _parse_porcelain("\n".join(lines[1:]))
-
-    staged = [f for f in all_files if f.is_staged and f.index_status not in ("?", "!")]
-    unstaged = [f for f in all_files if f.is_unstaged and f.index_status != "?"]
-    untracked = [f for f in all_files if f.index_status == "?" and f.work_status == "?"]
+def get_status(repo_path: Optional[str] = None) -> RepoStatus:
+    """
+    Return a structured representation of the current working tree status.
+
+    Results are cached briefly per repository state (see app.core.cache);
+    concurrent callers share one `git status` run. Staging through GitSage
+    bumps the repo generation, so it is reflected immediately.
+    """
+    key = (repo_state_key(repo_path), _index_mtime(repo_path))
+    return _status_cache.get_or_compute(key, lambda: _load_status(repo_path))
+
+
+def warm_up(repo_path: Optional[str] = None) -> None:
+    """
+    Prime the per-repo state used by get_status: the resolved path, the
+    HEAD-resolving cat-file worker, the pygit2 repository and the status cache.
+    """
+    get_status(repo_path)
+
+
+def _load_status(repo_path: Optional[str]) -> RepoStatus:
+    result = None
+    if pygit2 is not None:
+        try:
+            result = _status_from_libgit2(repo_path)
+        except GitSageError:
+            raise
+        except Exception as exc:
+            # e.g. a split index or a SHA-256 repo, which git reads but
+            # libgit2 does not. Use the CLI for this repo from now on.
+            logger.info("libgit2 cannot read %s (%s); using git status", repo_path, exc)
+            path = _resolve_repo(repo_path)
+            with _repos_lock:
+                _repos[path] = None
+                _repos.move_to_end(path)
+                if len(_repos) > _MAX_REPOS:
+                    _repos.popitem(last=False)
+    if result is None:
+        raw = run_git(["status", "--porcelain=v2", "--branch", "-z"], repo_path, binary=True)
+        result = _parse_and_classify(raw)
+    branch, ahead, behind, staged, unstaged, untracked = result
 
     return RepoStatus(
         branch=branch,
@@ -89,19 +202,152 @@ def get_status(repo_path: Optional[str] = None) -> RepoStatus:
     )
 
 
+# One pygit2.Repository per repo, reused across requests so libgit2 keeps its
+# index and object caches warm. Access is serialized per repository. None
+# marks a repo libgit2 failed to read. Least recently used first, capped like
+# git_runner's workers since repo_path comes from the client.
+_MAX_REPOS = 16
+_repos: OrderedDict[Path, Optional[tuple["pygit2.Repository", threading.Lock]]] = OrderedDict()
+_repos_lock = threading.Lock()
+
+if pygit2 is not None:
+    _FS = pygit2.enums.FileStatus
+    # libgit2 status bits -> porcelain X / Y letters.
+    _INDEX_CODES = (
+        (_FS.INDEX_NEW, "A"),
+        (_FS.INDEX_MODIFIED, "M"),
+        (_FS.INDEX_DELETED, "D"),
+        (_FS.INDEX_RENAMED, "R"),
+        (_FS.INDEX_TYPECHANGE, "T"),
+    )
+    _WORKTREE_CODES = (
+        (_FS.WT_MODIFIED, "M"),
+        (_FS.WT_DELETED, "D"),
+        (_FS.WT_RENAMED, "R"),
+        (_FS.WT_TYPECHANGE, "T"),
+    )
+    _EMPTY_BLOB_ID = pygit2.Oid(hex="e69de29bb2d1d6434b8b29ae775ad8c2e48c5391")
+
+
+def _get_repository(
+    repo_path: Optional[str],
+) -> Optional[tuple["pygit2.Repository", threading.Lock]]:
+    path = _resolve_repo(repo_path)
+    with _repos_lock:
+        if path in _repos:
+            _repos.move_to_end(path)
+            return _repos[path]
+        if pygit2.discover_repository(str(path)) is None:
+            raise RepoNotFoundError()
+        entry = _repos[path] = (pygit2.Repository(str(path)), threading.Lock())
+        if len(_repos) > _MAX_REPOS:
+            # A request still holding the evicted Repository keeps it alive.
+            _repos.popitem(last=False)
+    return entry
+
+
+def _status_from_libgit2(
+    repo_path: Optional[str],
+) -> Optional[tuple[str, int, int, list[FileStatus], list[FileStatus], list[FileStatus]]]:
+    """
+    Same result as _parse_and_classify(), read in-process through libgit2.
+
+    Returns None when libgit2's answer could differ from `git status`, so the
+    caller falls back to the CLI: on conflicts (libgit2 has no per-side
+    codes), when files are both added and deleted in the index (a possible
+    rename, which libgit2 does not detect here), for `git add -N` entries
+    (libgit2 reports them as staged, git as unstaged " A"), and for repos
+    libgit2 already failed to read.
+    """
+    entry = _get_repository(repo_path)
+    if entry is None:
+        return None
+    repo, lock = entry
+    with lock:
+        # Reload the index if it changed on disk. status() does this too, but
+        # silently carries on with a bogus index when it cannot parse the new
+        # one (e.g. after `git update-index --split-index`); read() raises.
+        repo.index.read(False)
+        entries = repo.status(untracked_files="normal")
+        ahead = behind = 0
+        if repo.head_is_detached:
+            branch = "HEAD (no branch)"
+        else:
+            ref = repo.references["HEAD"].target
+            branch = ref.removeprefix("refs/heads/")
+            if not repo.head_is_unborn:
+                upstream = repo.branches.local[branch].upstream
+                if upstream is not None:
+                    ahead, behind = repo.ahead_behind(repo.head.target, upstream.target)
+        # Intent-to-add entries are staged as the empty blob. A really staged
+        # empty file looks the same and merely takes the CLI path too.
+        intent_to_add = {
+            path
+            for path, flags in entries.items()
+            if flags & _FS.INDEX_NEW and repo.index[path].id == _EMPTY_BLOB_ID
+        }
+
+    staged: list[FileStatus] = []
+    unstaged: list[FileStatus] = []
+    untracked: list[FileStatus] = []
+    added = deleted = False
+    for path, flags in entries.items():
+        if flags & _FS.IGNORED:
+            continue
+        if flags & _FS.CONFLICTED:
+            return None
+        if flags & _FS.INDEX_NEW:
+            if path in intent_to_add:
+                return None
+            added = True
+        deleted = deleted or bool(flags & _FS.INDEX_DELETED)
+        if not path.isascii():
+            # pygit2 hands back undecodable bytes as surrogate escapes, which
+            # orjson rejects; decode them like the CLI parser does.
+            path = _decode_path(os.fsencode(path))
+        if flags & _FS.WT_NEW:
+            # Also set alongside INDEX_DELETED after `git rm --cached`, where
+            # git reports both a staged deletion and an untracked file.
+            untracked.append(FileStatus(path, "?", "?", False, True))
+            if flags == _FS.WT_NEW:
+                continue
+        x = next((c for bit, c in _INDEX_CODES if flags & bit), " ")
+        y = next((c for bit, c in _WORKTREE_CODES if flags & bit), " ")
+        is_staged = x != " "
+        is_unstaged = y != " "
+        f = FileStatus(path, x, y, is_staged, is_unstaged)
+        if is_staged:
+            staged.append(f)
+        if is_unstaged:
+            unstaged.append(f)
+    if added and deleted:
+        return None
+    return branch, ahead, behind, staged, unstaged, untracked
+
+
+def _validate_path(file_path: str) -> str:
+    """
+    Reject paths that are empty, look like flags, contain control characters,
+    are absolute, or step outside the repo via a ".." component.
+    """
+    if (
+        not file_path
+        or file_path[0] in "-/\\"
+        or _PATH_CTRL_RE.search(file_path)
+        or ".." in file_path.replace("\\", "/").split("/")
+    ):
+        raise ValueError(f"Invalid file path: {file_path!r}")
+    return file_path
+
+
 def stage_file(file_path: str, repo_path: Optional[str] = None) -> None:
     """Stage a single file. file_path is relative to the repo root."""
-    # Basic validation: reject paths that look like flags or contain null bytes
-    if file_path.startswith("-") or "\x00" in file_path:
-        raise ValueError(f"Invalid file path: {file_path!r}")
-    run_git(["add", "--", file_path], repo_path)
+    run_git(["add", "--", _validate_path(file_path)], repo_path)
 
 
 def unstage_file(file_path: str, repo_path: Optional[str] = None) -> None:
     """Unstage a single file."""
-    if file_path.startswith("-") or "\x00" in file_path:
-        raise ValueError(f"Invalid file path: {file_path!r}")
-    run_git(["restore", "--staged", "--", file_path], repo_path)
+    run_git(["restore", "--staged", "--", _validate_path(file_path)], repo_path)
 
 
 def stage_all(repo_path: Optional[str] = None) -> None:
@@ -109,10 +355,46 @@ def stage_all(repo_path: Optional[str] = None) -> None:
     run_git(["add", "-A"], repo_path)
 
 
+def _capped_diff(args: list[str], repo_path: Optional[str]) -> str:
+    # git stops once MAX_DIFF_BYTES + 1 bytes are read, so a huge diff is
+    # never loaded in full just to be cut.
+    max_bytes = settings.MAX_DIFF_BYTES
+    raw = run_git(args, repo_path, binary=True, max_bytes=max_bytes)
+    if len(raw) > max_bytes:
+        # "ignore" drops a multi-byte character split at the cut.
+        return raw[:max_bytes].decode("utf-8", "ignore") + "\n\n[diff truncated — too large]"
+    return raw.decode("utf-8", "replace")
+
+
 def get_staged_diff(repo_path: Optional[str] = None) -> str:
     """Return the diff of staged changes, capped at MAX_DIFF_BYTES."""
-    diff = run_git(["diff", "--cached"], repo_path)
-    max_bytes = settings.MAX_DIFF_BYTES
-    if len(diff) > max_bytes:
-        diff = diff[:max_bytes] + "\n\n[diff truncated — too large]"
-    return diff
\ No newline at end of file
+    return _capped_diff(["diff", "--cached"], repo_path)
+
+
+def get_unstaged_diff(repo_path: Optional[str] = None) -> str:
+    """Return the diff of unstaged changes to tracked files, capped at MAX_DIFF_BYTES."""
+    return _capped_diff(["diff"], repo_path)
+
+
+def get_overview(repo_path: Optional[str] = None) -> StatusOverview:
+    """
+    Return status plus staged and unstaged diffs in one call.
+
+    The three git runs are independent, so on a cache miss they run
+    concurrently and the wall time is that of the slowest one. The diff pair
+    is cached under the same key as get_status.
+    """
+    key = (repo_state_key(repo_path), _index_mtime(repo_path))
+    status = _overview_pool.submit(get_status, repo_path)
+    staged_diff, unstaged_diff = _diff_cache.get_or_compute(key, lambda: _load_diffs(repo_path))
+    return StatusOverview(
+        status=status.result(),
+        staged_diff=staged_diff,
+        unstaged_diff=unstaged_diff,
+    )
+
+
+def _load_diffs(repo_path: Optional[str]) -> tuple[str, str]:
+    staged = _overview_pool.submit(get_staged_diff, repo_path)
+    unstaged = get_unstaged_diff(repo_path)
+    return staged.result(), unstaged
\ No newline at end of file
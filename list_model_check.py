@@ -1,5 +1,5 @@
 import os
-import google.generativeai as genai
+import sys
 
 def main():
     print("=== GIT SAGE: GEMINI MODEL CHECKER ===\n")
@@ -13,14 +13,16 @@ def main():
     if not api_key:
         print("❌ Error: API KEY MUST BE FILLED.")
         return
+    # Imported only once a key is available; the SDK is slow to import
+    import google.generativeai as genai
+
     try:
         genai.configure(api_key=api_key)
         
         print("\n🔄 Loading model list...\n")
         
-        # Header Tabel
-        print(f"{'ID MODEL':<25} | {'NAME':<30} | {'TOKEN INPUT'}")
-        print("-" * 75)
+        # Header Tabel; rows are collected and written once at the end
+        rows = [f"{'ID MODEL':<25} | {'NAME':<30} | {'TOKEN INPUT'}", "-" * 75]
 
         found = False
         for m in genai.list_models():
@@ -31,10 +33,11 @@ def main():
                 display_name = m.display_name
                 input_limit = str(m.input_token_limit)
                 
-                print(f"{model_id:<25} | {display_name:<30} | {input_limit}")
+                rows.append(f"{model_id:<25} | {display_name:<30} | {input_limit}")
                 found = True
 
-        print("-" * 75)
+        rows.append("-" * 75)
+        sys.stdout.write("\n".join(rows) + "\n")
         
         if found:
             print("\n✅ Tips: USE 'ID MODEL' in file .env GitSage.")
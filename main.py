@@ -3,22 +3,25 @@ GitSage - Local Git management with AI-powered features.
 Entry point for the FastAPI application.
 """
 
+import asyncio
 import logging
 import os
 import sys
 from contextlib import asynccontextmanager
 
-import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from app.api import commits, branches, status, ai, remotes
 from app.core.config import settings
 from app.core.exceptions import GitSageError
+from app.core.git_runner import close_workers
+from app.services.ai_service import close_client, open_client
+from app.services.status_service import warm_up
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,10 +30,60 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+_HEALTH_BODY = b'{"status":"ok"}'
+_HEALTH_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_HEALTH_BODY)).encode()),
+]
+_HEALTH_405_BODY = b'{"detail":"Method Not Allowed"}'
+_HEALTH_405_HEADERS = [
+    (b"allow", b"GET, HEAD"),
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_HEALTH_405_BODY)).encode()),
+]
+
+
+class HealthCheckMiddleware:
+    """
+    Answer /health directly with a pre-encoded body: 200 for GET and HEAD
+    (without a body), 405 for anything else, as the old route did.
+
+    Added last, so it sits outside the other middleware: load-balancer probes
+    skip host/CORS checks, routing and JSON encoding entirely.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/health":
+            method = scope["method"]
+            if method in ("GET", "HEAD"):
+                status, headers, body = 200, _HEALTH_HEADERS, _HEALTH_BODY
+            else:
+                status, headers, body = 405, _HEALTH_405_HEADERS, _HEALTH_405_BODY
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": b"" if method == "HEAD" else body})
+            return
+        await self.app(scope, receive, send)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("GitSage starting up...")
+    if settings.gemini_configured:
+        open_client()
+    # The first page load asks for the default repo's status; do that work now.
+    # Best effort only: whatever goes wrong here, the server still starts.
+    try:
+        await asyncio.to_thread(warm_up)
+    except GitSageError as exc:
+        logger.warning("Could not warm up the default repository: %s", exc.message)
+    except Exception:
+        logger.warning("Could not warm up the default repository.", exc_info=True)
     yield
+    await close_client()
+    close_workers()
     logger.info("GitSage shutting down.")
 
 
@@ -39,6 +92,10 @@ app = FastAPI(
     description="Local Git management with AI-powered commit messages and error diagnosis.",
     version="1.0.0",
     lifespan=lifespan,
+    # GET routes return the services' dataclasses in an ORJSONResponse, which
+    # serializes them natively without pydantic validation; their *Out models
+    # are only referenced in `responses=` to document the schema.
+    default_response_class=ORJSONResponse,
     docs_url="/api/docs" if settings.DEBUG else None,
     redoc_url=None,
 )
@@ -57,11 +114,15 @@ app.add_middleware(
     allow_headers=["Content-Type", "X-Requested-With"],
 )
 
+# Outermost user middleware; see HealthCheckMiddleware.
+app.add_middleware(HealthCheckMiddleware)
+
 app.mount("/static", StaticFiles(directory="frontend/static"), name="static")
 
 templates = Jinja2Templates(directory="frontend/templates")
 
-# Register routers
+# Register routers. Handlers that shell out to git are plain `def` functions so
+# FastAPI runs them in its threadpool instead of blocking the event loop.
 app.include_router(commits.router, prefix="/api/commits", tags=["commits"])
 app.include_router(branches.router, prefix="/api/branches", tags=["branches"])
 app.include_router(status.router, prefix="/api/status", tags=["status"])
@@ -85,16 +146,19 @@ async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
-@app.get("/health")
-async def health():
-    return {"status": "ok"}
-
-
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "main:app",
         host="127.0.0.1",
         port=settings.PORT,
         reload=settings.DEBUG,
+        loop=settings.UVICORN_LOOP,
+        http=settings.UVICORN_HTTP,
+        # Read caches are per process: with several workers, a write seen by
+        # one only reaches the others once their cache TTLs expire.
+        workers=1 if settings.DEBUG else (settings.UVICORN_WORKERS or os.cpu_count()),
+        access_log=False,
         log_level="info",
     )
\ No newline at end of file
@@ -16,9 +16,9 @@ echo "==> Running GitSage tests"
 
 if [ "${1:-}" = "--fast" ]; then
   # Skip coverage for quick iteration
-  python -m pytest tests/ -v -x
+  python -m pytest tests/ -v -x -n auto
 else
-  python -m pytest tests/ -v \
+  python -m pytest tests/ -v -n auto \
     --cov=app \
     --cov-report=term-missing \
     --cov-report=html:htmlcov \
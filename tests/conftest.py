@@ -2,21 +2,30 @@
 Shared pytest fixtures.
 """
 
+import os
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
+import httpx
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
 
 from app.core.config import settings
 
 
 @pytest.fixture(scope="session")
 def tmp_git_repo() -> Generator[Path, None, None]:
-    """Create a temporary git repository for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
+    """
+    Create a temporary git repository for testing.
+
+    Under pytest-xdist each worker process gets its own repo, named after
+    its worker id, so parallel tests never share an index.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    with tempfile.TemporaryDirectory(prefix=f"gitsage-{worker}-") as tmpdir:
         repo = Path(tmpdir)
         subprocess.run(["git", "init", str(repo)], check=True, capture_output=True)
         subprocess.run(
@@ -38,17 +47,34 @@ def tmp_git_repo() -> Generator[Path, None, None]:
 
 
 @pytest.fixture
-def app_client(tmp_git_repo, monkeypatch):
-    """FastAPI test client with the temp repo as default path."""
-    monkeypatch.setenv("DEFAULT_REPO_PATH", str(tmp_git_repo))
-    monkeypatch.setenv("DEBUG", "true")
+def clean_git_repo(tmp_git_repo) -> Generator[Path, None, None]:
+    """The shared temp repo, with worktree and index changes discarded afterwards."""
+    yield tmp_git_repo
+    subprocess.run(["git", "reset", "--hard", "HEAD"], cwd=tmp_git_repo, capture_output=True)
+    subprocess.run(["git", "clean", "-fdx"], cwd=tmp_git_repo, capture_output=True)
+
 
-    # Reload settings cache so the new env var is picked up
-    from app.core import config
-    config.get_settings.cache_clear()
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def app_client(tmp_git_repo) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """
+    Async HTTP client for the app, with the temp repo as default path.
 
+    Session-scoped: the app's lifespan runs once for the whole run. Tests using
+    it must share the session event loop (pytest.mark.asyncio(loop_scope=
+    "session")). Settings are frozen and read at import time, so the runner's
+    copy is swapped out directly.
+    """
+    from app.core import git_runner
     from main import app
-    with TestClient(app) as client:
-        yield client
 
-    config.get_settings.cache_clear()
\ No newline at end of file
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            git_runner,
+            "settings",
+            settings.model_copy(update={"DEFAULT_REPO_PATH": str(tmp_git_repo)}),
+        )
+        async with LifespanManager(app) as manager:
+            # TrustedHostMiddleware only admits localhost.
+            transport = httpx.ASGITransport(app=manager.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+                yield client
@@ -0,0 +1,10 @@
+"""
+Fixtures for the API integration tests.
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _reset_repo(clean_git_repo) -> None:
+    """Every API test may write to the shared repo; reset it after each one."""
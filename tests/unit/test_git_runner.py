@@ -0,0 +1,185 @@
+"""
+Unit tests for the git runner's persistent worker and read-cache invalidation.
+"""
+
+import subprocess
+
+import pytest
+
+from app.core.git_runner import close_workers, resolve_rev, run_git
+
+
+class TestResolveRev:
+    def test_resolves_head(self, tmp_git_repo):
+        expected = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=tmp_git_repo, check=True, capture_output=True, text=True,
+        ).stdout.strip()
+        assert resolve_rev("HEAD", str(tmp_git_repo)) == expected
+
+    def test_missing_rev_returns_none(self, tmp_git_repo):
+        assert resolve_rev("no-such-branch", str(tmp_git_repo)) is None
+
+    def test_sees_new_commits(self, tmp_git_repo):
+        before = resolve_rev("HEAD", str(tmp_git_repo))
+        subprocess.run(
+            ["git", "commit", "--allow-empty", "-m", "chore: empty"],
+            cwd=tmp_git_repo, check=True, capture_output=True,
+        )
+        after = resolve_rev("HEAD", str(tmp_git_repo))
+        assert after is not None and after != before
+
+    def test_restarts_after_close(self, tmp_git_repo):
+        close_workers()
+        assert resolve_rev("HEAD", str(tmp_git_repo)) is not None
+
+    def test_failed_worker_is_dropped(self, tmp_path):
+        from app.core import git_runner
+        from app.core.exceptions import GitSageError
+
+        (tmp_path / ".git").mkdir()  # Passes path resolution, but git refuses it.
+        with pytest.raises(GitSageError):
+            resolve_rev("HEAD", str(tmp_path))
+        assert tmp_path.resolve() not in git_runner._workers
+        close_workers()
+
+    def test_least_recently_used_worker_is_evicted(self, tmp_git_repo, tmp_path, monkeypatch):
+        from app.core import git_runner
+
+        close_workers()
+        monkeypatch.setattr(git_runner, "_MAX_WORKERS", 1)
+        subprocess.run(["git", "init", str(tmp_path)], check=True, capture_output=True)
+        resolve_rev("HEAD", str(tmp_git_repo))
+        first = git_runner._workers[tmp_git_repo.resolve()]
+        resolve_rev("HEAD", str(tmp_path))
+        assert list(git_runner._workers) == [tmp_path.resolve()]
+        assert not first.alive
+        close_workers()
+
+    def test_rejects_option_like_rev(self, tmp_git_repo):
+        with pytest.raises(ValueError):
+            resolve_rev("--all", str(tmp_git_repo))
+
+
+@pytest.mark.usefixtures("clean_git_repo")
+class TestRepoResolution:
+    def test_subdirectory_rejected(self, tmp_git_repo):
+        from app.core.exceptions import RepoNotFoundError
+
+        (tmp_git_repo / "sub").mkdir()
+        with pytest.raises(RepoNotFoundError):
+            run_git(["status"], str(tmp_git_repo / "sub"))
+
+    def test_worktree_index_path(self, tmp_git_repo, tmp_path):
+        from app.core.git_runner import index_path
+
+        worktree = tmp_path / "wt"
+        run_git(["worktree", "add", "--detach", str(worktree)], str(tmp_git_repo))
+        try:
+            path = index_path(str(worktree))
+            assert path.is_file()
+            assert path != worktree / ".git" / "index"
+        finally:
+            run_git(["worktree", "remove", "--force", str(worktree)], str(tmp_git_repo))
+
+
+class TestMaxBytes:
+    def test_output_is_cut_after_cap(self, tmp_git_repo):
+        out = run_git(["log", "--format=%H"], str(tmp_git_repo), binary=True, max_bytes=10)
+        assert len(out) == 11
+
+    def test_short_output_is_complete(self, tmp_git_repo):
+        full = run_git(["log", "--format=%H"], str(tmp_git_repo))
+        assert run_git(["log", "--format=%H"], str(tmp_git_repo), max_bytes=10_000) == full
+
+    def test_errors_still_raise(self, tmp_git_repo):
+        from app.core.exceptions import GitCommandError
+
+        with pytest.raises(GitCommandError):
+            run_git(["log", "no-such-branch"], str(tmp_git_repo), max_bytes=10)
+
+
+class TestDeadline:
+    def test_kills_hung_process(self):
+        from app.core.git_runner import _Deadline
+
+        proc = subprocess.Popen(["sleep", "30"], stdout=subprocess.PIPE)
+        deadline = _Deadline(proc, timeout=0.2)
+        assert proc.stdout.read() == b""  # Returns once the process is killed.
+        proc.wait()
+        proc.stdout.close()
+        assert deadline.expired
+
+    def test_cancel_leaves_process_alone(self):
+        from app.core.git_runner import _Deadline
+
+        proc = subprocess.Popen(["sleep", "0.3"])
+        deadline = _Deadline(proc, timeout=0.1)
+        deadline.cancel()
+        assert proc.wait() == 0
+        assert not deadline.expired
+
+
+@pytest.mark.usefixtures("clean_git_repo")
+class TestReadCache:
+    def test_mutation_invalidates_cached_branches(self, tmp_git_repo):
+        from app.services.branch_service import create_branch, delete_branch, list_branches
+
+        repo = str(tmp_git_repo)
+        before = {b.name for b in list_branches(repo)}
+        create_branch("cache-probe", checkout=False, repo_path=repo)
+        try:
+            after = {b.name for b in list_branches(repo)}
+            assert after == before | {"cache-probe"}
+        finally:
+            delete_branch("cache-probe", repo_path=repo)
+        assert "cache-probe" not in {b.name for b in list_branches(repo)}
+
+    def test_state_key_tracks_head(self, tmp_git_repo):
+        from app.core.git_runner import repo_state_key
+
+        before = repo_state_key(str(tmp_git_repo))
+        assert repo_state_key(str(tmp_git_repo)) == before
+        subprocess.run(
+            ["git", "commit", "--allow-empty", "-m", "chore: outside gitsage"],
+            cwd=tmp_git_repo, check=True, capture_output=True,
+        )
+        assert repo_state_key(str(tmp_git_repo)) != before
+
+    def test_concurrent_misses_share_one_compute(self):
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        from app.core.cache import TTLCache
+
+        cache = TTLCache(ttl=10)
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(timeout=5)
+            return "value"
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(cache.get_or_compute, "key", compute) for _ in range(4)]
+            time.sleep(0.05)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert results == ["value"] * 4
+        assert len(calls) == 1
+
+    def test_staging_is_visible_immediately(self, tmp_git_repo):
+        from app.services.status_service import get_status, stage_file
+
+        repo = str(tmp_git_repo)
+        (tmp_git_repo / "cache_probe.txt").write_text("probe")
+        try:
+            assert "cache_probe.txt" in {f.path for f in get_status(repo).untracked}
+            stage_file("cache_probe.txt", repo)
+            assert "cache_probe.txt" in {f.path for f in get_status(repo).staged}
+        finally:
+            subprocess.run(["git", "rm", "-q", "--cached", "cache_probe.txt"], cwd=tmp_git_repo)
+            (tmp_git_repo / "cache_probe.txt").unlink()
@@ -0,0 +1,58 @@
+"""
+Unit tests for service-layer parsing of git output.
+"""
+
+import pytest
+
+from app.core.git_runner import run_git
+from app.services import commit_service
+from app.services.commit_service import create_commit
+from app.services.remote_service import Remote, _load_remotes
+
+
+@pytest.mark.usefixtures("clean_git_repo")
+class TestRemoteParsing:
+    def test_separate_push_url_and_path_with_spaces(self, tmp_git_repo, tmp_path):
+        repo = str(tmp_git_repo)
+        fetch_url = str(tmp_path / "dir with spaces" / "upstream.git")
+        run_git(["remote", "add", "origin", fetch_url], repo)
+        run_git(["remote", "set-url", "--push", "origin", "git@example.com:team/app.git"], repo)
+        try:
+            assert _load_remotes(repo) == [
+                Remote("origin", fetch_url, "git@example.com:team/app.git"),
+            ]
+        finally:
+            run_git(["remote", "remove", "origin"], repo)
+
+
+@pytest.mark.usefixtures("clean_git_repo")
+class TestCommitSha:
+    def _commit(self, repo, monkeypatch, name: str) -> str:
+        calls = []
+
+        def recording_run_git(args, *a, **kw):
+            calls.append(args[0])
+            return run_git(args, *a, **kw)
+
+        (repo / name).write_text(name)
+        run_git(["add", name], str(repo))
+        monkeypatch.setattr(commit_service, "run_git", recording_run_git)
+        sha = create_commit(f"test: add {name}", str(repo))
+        monkeypatch.undo()
+        # Read from the commit summary line, without a rev-parse fallback.
+        assert calls == ["commit"]
+        return sha
+
+    def test_sha_on_branch(self, tmp_git_repo, monkeypatch):
+        sha = self._commit(tmp_git_repo, monkeypatch, "on-branch.txt")
+        assert sha == run_git(["rev-parse", "--short", "HEAD"], str(tmp_git_repo)).strip()
+
+    def test_sha_on_detached_head(self, tmp_git_repo, monkeypatch):
+        repo = str(tmp_git_repo)
+        branch = run_git(["rev-parse", "--abbrev-ref", "HEAD"], repo).strip()
+        run_git(["checkout", "--detach"], repo)
+        try:
+            sha = self._commit(tmp_git_repo, monkeypatch, "detached.txt")
+            assert sha == run_git(["rev-parse", "--short", "HEAD"], repo).strip()
+        finally:
+            run_git(["checkout", branch], repo)
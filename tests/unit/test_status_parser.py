@@ -0,0 +1,138 @@
+"""
+Unit tests for the `git status --porcelain=v2 -z` parser.
+"""
+
+import os
+
+import pytest
+
+from app.core.git_runner import run_git
+from app.services import status_service
+from app.services.status_service import _parse_and_classify
+
+_OID = "0" * 40
+_HEADER = "\x00".join([
+    f"# branch.oid {_OID}",
+    "# branch.head main",
+    "# branch.upstream origin/main",
+    "# branch.ab +2 -3",
+])
+
+
+def _parse(*records: str):
+    return _parse_and_classify(("\x00".join([_HEADER, *records]) + "\x00").encode())
+
+
+class TestPorcelainV2Parser:
+    def test_branch_header(self):
+        assert _parse() == ("main", 2, 3, [], [], [])
+
+    def test_detached_head(self):
+        branch, *_ = _parse_and_classify(f"# branch.oid {_OID}\x00# branch.head (detached)\x00".encode())
+        assert branch == "HEAD (no branch)"
+
+    def test_ordinary_change_maps_dot_to_space(self):
+        _, _, _, staged, unstaged, untracked = _parse(
+            f"1 .M N... 100644 100644 100644 {_OID} {_OID} src/app.py"
+        )
+        assert staged == [] and untracked == []
+        f = unstaged[0]
+        assert (f.path, f.index_status, f.work_status) == ("src/app.py", " ", "M")
+
+    def test_partially_staged_file_in_both_buckets(self):
+        _, _, _, staged, unstaged, _ = _parse(
+            f"1 MM N... 100644 100644 100644 {_OID} {_OID} both.py"
+        )
+        assert [f.path for f in staged] == [f.path for f in unstaged] == ["both.py"]
+
+    def test_path_with_spaces_is_not_quoted(self):
+        _, _, _, staged, _, _ = _parse(f"1 M. N... 100644 100644 100644 {_OID} {_OID} my file.txt")
+        assert staged[0].path == "my file.txt"
+
+    def test_rename_consumes_original_path(self):
+        _, _, _, staged, unstaged, untracked = _parse(
+            f"2 R. N... 100644 100644 100644 {_OID} {_OID} R100 new name.py",
+            "old name.py",
+            "? untracked.txt",
+        )
+        assert [(f.path, f.index_status) for f in staged] == [("new name.py", "R")]
+        assert unstaged == []
+        assert [f.path for f in untracked] == ["untracked.txt"]
+
+    def test_unmerged_entry(self):
+        _, _, _, staged, unstaged, _ = _parse(
+            f"u UU N... 100644 100644 100644 100644 {_OID} {_OID} {_OID} conflict.txt"
+        )
+        assert staged == unstaged
+        assert (staged[0].path, staged[0].index_status, staged[0].work_status) == ("conflict.txt", "U", "U")
+
+    def test_non_utf8_path_is_decoded_with_replacement(self):
+        raw = f"1 M. N... 100644 100644 100644 {_OID} {_OID} caf".encode() + b"\xe9.txt\x00"
+        _, _, _, staged, _, _ = _parse_and_classify(raw)
+        assert staged[0].path == "caf\ufffd.txt"
+
+
+@pytest.mark.skipif(status_service.pygit2 is None, reason="pygit2 not installed")
+@pytest.mark.usefixtures("clean_git_repo")
+class TestLibgit2Status:
+    def test_matches_git_cli(self, tmp_git_repo):
+        (tmp_git_repo / "tracked.txt").write_text("tracked")
+        run_git(["add", "tracked.txt"], str(tmp_git_repo))
+        run_git(["commit", "-m", "test: add tracked.txt"], str(tmp_git_repo))
+        # Staged deletion plus an untracked copy of the same path.
+        run_git(["rm", "--cached", "tracked.txt"], str(tmp_git_repo))
+        (tmp_git_repo / "README.md").write_text("# Staged")
+        run_git(["add", "README.md"], str(tmp_git_repo))
+        (tmp_git_repo / "README.md").write_text("# Staged, then changed")
+        (tmp_git_repo / "new.txt").write_text("new")
+
+        raw = run_git(["status", "--porcelain=v2", "--branch", "-z"], str(tmp_git_repo), binary=True)
+        assert status_service._status_from_libgit2(str(tmp_git_repo)) == _parse_and_classify(raw)
+
+    def test_intent_to_add_matches_git_cli(self, tmp_git_repo):
+        (tmp_git_repo / "n.txt").write_text("new")
+        run_git(["add", "-N", "n.txt"], str(tmp_git_repo))
+
+        raw = run_git(["status", "--porcelain=v2", "--branch", "-z"], str(tmp_git_repo), binary=True)
+        assert status_service._status_from_libgit2(str(tmp_git_repo)) is None
+        status = status_service._load_status(str(tmp_git_repo))
+        assert (status.staged, status.unstaged) == _parse_and_classify(raw)[3:5]
+
+    def test_staged_rename_matches_git_cli(self, tmp_git_repo):
+        run_git(["mv", "README.md", "moved.md"], str(tmp_git_repo))
+
+        raw = run_git(["status", "--porcelain=v2", "--branch", "-z"], str(tmp_git_repo), binary=True)
+        status = status_service._load_status(str(tmp_git_repo))
+        assert status.staged == _parse_and_classify(raw)[3]
+        assert [(f.path, f.index_status) for f in status.staged] == [("moved.md", "R")]
+
+    def test_non_utf8_path_is_serializable(self, tmp_git_repo):
+        import orjson
+
+        with open(os.fsencode(tmp_git_repo) + b"/caf\xe9.txt", "w") as fh:
+            fh.write("x")
+
+        raw = run_git(["status", "--porcelain=v2", "--branch", "-z"], str(tmp_git_repo), binary=True)
+        assert status_service._status_from_libgit2(str(tmp_git_repo)) == _parse_and_classify(raw)
+        orjson.dumps(status_service._load_status(str(tmp_git_repo)))
+
+    def test_split_index_falls_back_to_git_cli(self, tmp_git_repo):
+        run_git(["update-index", "--split-index"], str(tmp_git_repo))
+        try:
+            (tmp_git_repo / "README.md").write_text("# Changed")
+            status = status_service._load_status(str(tmp_git_repo))
+            assert [f.path for f in status.unstaged] == ["README.md"]
+            assert status_service._get_repository(str(tmp_git_repo)) is None
+        finally:
+            run_git(["update-index", "--no-split-index"], str(tmp_git_repo))
+            status_service._repos.pop(tmp_git_repo.resolve(), None)
+
+    def test_repository_cache_is_bounded(self, tmp_git_repo, tmp_path, monkeypatch):
+        import subprocess
+
+        monkeypatch.setattr(status_service, "_MAX_REPOS", 1)
+        monkeypatch.setattr(status_service, "_repos", type(status_service._repos)())
+        subprocess.run(["git", "init", str(tmp_path)], check=True, capture_output=True)
+        status_service._load_status(str(tmp_git_repo))
+        status_service._load_status(str(tmp_path))
+        assert list(status_service._repos) == [tmp_path.resolve()]
@@ -7,6 +7,7 @@ import pytest
 from app.core.exceptions import InvalidPathError, RepoNotFoundError
 from app.services.commit_service import _is_valid_ref_name, _sanitize_commit_message
 from app.services.ai_service import _is_safe_auto_fix
+from app.services.status_service import _validate_path
 
 
 class TestRefNameValidation:
@@ -38,6 +39,20 @@ class TestRefNameValidation:
         assert _is_valid_ref_name("a" * 251) is False
 
 
+class TestFilePathValidation:
+    @pytest.mark.parametrize("path", ["README.md", "src/app.py", "docs/a..b.md"])
+    def test_relative_paths_valid(self, path):
+        assert _validate_path(path) == path
+
+    @pytest.mark.parametrize(
+        "path",
+        ["", "-A", "/etc/passwd", "../etc/passwd", "src/../../x", "a\x00b", "a\nb"],
+    )
+    def test_unsafe_paths_rejected(self, path):
+        with pytest.raises(ValueError):
+            _validate_path(path)
+
+
 class TestCommitMessageSanitization:
     def test_strips_null_bytes(self):
         result = _sanitize_commit_message("fix: bug\x00 fix")